@@ -12,10 +12,39 @@ Setup:
     3. (Optional) Set up launchd for auto-sync - see README
 """
 
+import gzip
+import hashlib
 import json
 import os
+import pickle
 import re
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
+
+# Optional: orjson parses the (potentially huge) Granola cache several times
+# faster than stdlib json. Falls back to json if it isn't installed.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# Optional: pysimdjson parses lazily, so only the state keys we actually read
+# get materialized as Python objects. Preferred over orjson for the big cache.
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+# Optional: pyahocorasick matches all keywords in one linear pass, which wins
+# once CLIENT_ROUTES grows past a dozen routes. Falls back to the first-char
+# keyword index scan if it isn't installed (pip install pyahocorasick).
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # --- CONFIGURE THESE ---
 
@@ -26,7 +55,10 @@ CACHE_PATH = os.path.expanduser("~/Library/Application Support/Granola/cache-v3.
 INBOX_DIR = os.path.expanduser("~/granola-transcripts/inbox")
 
 # Tracking file (keeps record of what's been synced)
-TRACKING_FILE = os.path.join(INBOX_DIR, ".synced_ids.json")
+TRACKING_FILE = os.path.join(INBOX_DIR, ".synced_ids.json.gz")
+
+# Pre-gzip tracking file; still read (once) if the new one doesn't exist yet
+_LEGACY_TRACKING_FILE = os.path.join(INBOX_DIR, ".synced_ids.json")
 
 # Parent folder for client/project directories
 CLIENTS_DIR = os.path.expanduser("~/granola-transcripts/clients")
@@ -43,64 +75,243 @@ CLIENT_ROUTES = {
 
 # --- END CONFIG ---
 
+# Sidecar holding the parsed cache state; when Granola's cache file hasn't
+# changed since the last run (checked via mtime), the JSON parse is skipped
+_STATE_CACHE = os.path.join(INBOX_DIR, ".state.pkl")
+
+# Built once at import so the sync loop doesn't pay per-transcript setup.
+# The translate table drops unsafe ASCII and maps spaces to dashes in a single
+# C-level pass; the regex only runs when non-ASCII survives the table, to
+# strip em-dashes/smart quotes while keeping accented word characters.
+_SANITIZE_TABLE = {ord(c): None for c in map(chr, range(128))
+                   if not (c.isalnum() or c in ' -_')}
+_SANITIZE_TABLE[ord(' ')] = ord('-')
+_UNSAFE_CHARS = re.compile(r'[^\w\s-]')
+_DASH_RUN = re.compile(r'-+')
+
+# Shared empty doc for cache misses; avoids allocating a fresh {} per lookup
+_EMPTY_DOC = {}
+
+
+def _build_route_trie():
+    """Index route keywords by first character for a single-pass title scan."""
+    trie = {}
+    for keywords, folder_name in CLIENT_ROUTES.items():
+        for kw in keywords:
+            kw = kw.lower()
+            if kw:
+                trie.setdefault(kw[0], []).append((kw, folder_name))
+    # Longest keyword first, so "acme corp" wins over "acme" at the same spot
+    for candidates in trie.values():
+        candidates.sort(key=lambda item: len(item[0]), reverse=True)
+    return trie
+
+
+_ROUTE_TRIE = _build_route_trie()
+
+
+def _build_route_automaton():
+    """Build an Aho-Corasick automaton over all route keywords, if available."""
+    if ahocorasick is None or not CLIENT_ROUTES:
+        return None
+    automaton = ahocorasick.Automaton()
+    for keywords, folder_name in CLIENT_ROUTES.items():
+        for kw in keywords:
+            automaton.add_word(kw.lower(), folder_name)
+    automaton.make_automaton()
+    return automaton
+
+
+_ROUTE_AC = _build_route_automaton()
+
+# Flat keyword tuple for the cheap "does anything match at all?" screen --
+# most titles hit no route, and str.__contains__ settles that common miss
+# in C before any per-position matching runs.
+_FLAT_KEYWORDS = tuple(kw.lower() for keywords in CLIENT_ROUTES for kw in keywords)
+
 
 def load_cache():
-    """Load and parse Granola's cache file."""
-    with open(CACHE_PATH, 'r') as f:
-        data = json.load(f)
-    # Granola nests a JSON string inside the top-level JSON
-    cache = json.loads(data['cache'])
-    return cache.get('state', {})
+    """Load and parse Granola's cache file, reusing the parsed sidecar if fresh."""
+    mtime_ns = os.stat(CACHE_PATH).st_mtime_ns
+    state = _load_state_cache(mtime_ns)
+    if state is not None:
+        return state
+
+    with open(CACHE_PATH, 'rb') as f:
+        raw = f.read()
+    if simdjson is not None:
+        state = _load_state_lazy(raw)
+    else:
+        data = _json_loads(raw)
+        # Granola nests a JSON string inside the top-level JSON
+        cache = _json_loads(data['cache'])
+        state = cache.get('state', {})
+
+    _save_state_cache(mtime_ns, state)
+    return state
+
+
+def _load_state_cache(mtime_ns):
+    """Return the cached parsed state if it matches the cache file's mtime."""
+    try:
+        with open(_STATE_CACHE, 'rb') as f:
+            cached = pickle.load(f)
+        if cached.get('mtime_ns') == mtime_ns:
+            return cached['state']
+    except Exception:
+        pass  # missing/torn sidecar just means we re-parse
+    return None
+
+
+def _save_state_cache(mtime_ns, state):
+    """Persist the parsed state alongside the cache file's mtime (best effort)."""
+    try:
+        os.makedirs(INBOX_DIR, exist_ok=True)
+        with open(_STATE_CACHE, 'wb') as f:
+            pickle.dump({'mtime_ns': mtime_ns, 'state': state}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        pass
+
+
+def _load_state_lazy(raw):
+    """Extract just transcripts/documents from the cache via simdjson.
+
+    Granola's cache holds a lot of state the sync never touches (calendar
+    events, panels, etc.); the lazy parser only materializes the keys we pull.
+    """
+    outer = simdjson.Parser().parse(raw)
+    inner = simdjson.Parser().parse(outer['cache'].encode())
+    try:
+        lazy_state = inner['state']
+    except KeyError:
+        return {}
+    state = {}
+    for key in ('transcripts', 'documents'):
+        try:
+            value = lazy_state[key]
+        except KeyError:
+            continue
+        if isinstance(value, simdjson.Object):
+            value = value.as_dict()
+        elif isinstance(value, simdjson.Array):
+            value = value.as_list()
+        state[key] = value
+    return state
 
 
 def load_tracking():
     """Load tracking data (synced IDs + metadata)."""
     if os.path.exists(TRACKING_FILE):
-        with open(TRACKING_FILE, 'r') as f:
-            data = json.load(f)
-        if isinstance(data, list):
-            return {id_: {"synced_at": "unknown", "routed": False, "file": None} for id_ in data}
-        return data
-    return {}
+        with gzip.open(TRACKING_FILE, 'rb') as f:
+            data = _json_loads(f.read())
+    elif os.path.exists(_LEGACY_TRACKING_FILE):
+        # Migrate from the old uncompressed file on first run
+        with open(_LEGACY_TRACKING_FILE, 'rb') as f:
+            data = _json_loads(f.read())
+    else:
+        return {}
+    if isinstance(data, list):
+        return {id_: {"synced_at": "unknown", "routed": False, "file": None} for id_ in data}
+    return data
 
 
 def save_tracking(tracking):
-    """Save tracking data."""
-    with open(TRACKING_FILE, 'w') as f:
-        json.dump(tracking, f, indent=2)
+    """Save tracking data (atomically, so a killed run can't tear the file)."""
+    # Nothing human reads this file, so skip pretty-printing; compresslevel=1
+    # keeps the gzip CPU cost negligible while still shrinking the bytes
+    if orjson is not None:
+        payload = orjson.dumps(tracking)
+    else:
+        payload = json.dumps(tracking, separators=(',', ':')).encode()
+    tmp_path = TRACKING_FILE + '.tmp'
+    with gzip.open(tmp_path, 'wb', compresslevel=1) as f:
+        f.write(payload)
+    os.replace(tmp_path, TRACKING_FILE)
+    # Once the gzipped file exists the old one is dead weight -- and anything
+    # still reading it (e.g. an old status snippet) would see stale data
+    try:
+        os.remove(_LEGACY_TRACKING_FILE)
+    except FileNotFoundError:
+        pass
+
+
+def _word_count(entries):
+    """Approximate word count via space counting -- no split() list per entry."""
+    total = 0
+    for e in entries:
+        text = e.get('text', '')
+        if text and not text.isspace():
+            total += text.count(' ') + 1
+    return total
 
 
 def is_meeting_done(doc, entries):
     """Check if a meeting is completed and worth syncing."""
     end_count = doc.get('meeting_end_count')
-    title = doc.get('title')
-    word_count = sum(len(e.get('text', '').split()) for e in entries) if entries else 0
-
     if not end_count or end_count < 1:
         return False
-    if not title:
+    if not doc.get('title'):
         return False
-    if word_count < 50:
-        return False
-    return True
 
+    # Only need to know whether we cross 50 words -- stop counting as soon
+    # as we do instead of scanning the whole transcript
+    word_count = 0
+    for e in entries:
+        text = e.get('text', '')
+        if text and not text.isspace():
+            word_count += text.count(' ') + 1
+            if word_count >= 50:
+                return True
+    return False
+
+
+def match_client(title, people=None, lowered=False):
+    """Match a meeting to a client folder based on title keywords.
 
-def match_client(title, people=None):
-    """Match a meeting to a client folder based on title keywords."""
-    search_text = (title or "").lower()
+    Pass lowered=True when the title is already lowercased to skip the copy.
+    """
+    search_text = (title or "") if lowered else (title or "").lower()
 
     if people and isinstance(people, dict):
         people_title = people.get('title', '')
         if people_title:
             search_text += " " + people_title.lower()
 
-    for keywords, folder_name in CLIENT_ROUTES.items():
-        for kw in keywords:
-            if kw in search_text:
+    if not any(kw in search_text for kw in _FLAT_KEYWORDS):
+        return None
+
+    if _ROUTE_AC is not None:
+        for _, folder_name in _ROUTE_AC.iter(search_text):
+            return folder_name
+        return None
+
+    # One left-to-right pass over the title; each position only tests the
+    # few keywords starting with that character, so keywords never rescan
+    # the text from the beginning like repeated `in` probes do
+    for i, ch in enumerate(search_text):
+        for kw, folder_name in _ROUTE_TRIE.get(ch, ()):
+            if search_text.startswith(kw, i):
                 return folder_name
     return None
 
 
+def _dir_contains(snapshots, dirpath, name):
+    """Check for a file using a cached directory listing.
+
+    One os.scandir per directory per run replaces a stat syscall for every
+    tracked doc's os.path.exists probe.
+    """
+    snapshot = snapshots.get(dirpath)
+    if snapshot is None:
+        try:
+            snapshot = {entry.name for entry in os.scandir(dirpath)}
+        except FileNotFoundError:
+            snapshot = set()
+        snapshots[dirpath] = snapshot
+    return name in snapshot
+
+
 def get_client_call_notes_dir(client_folder):
     """Get or create the call-notes subfolder for a client."""
     path = os.path.join(CLIENTS_DIR, client_folder, "call-notes")
@@ -111,56 +322,90 @@ def get_client_call_notes_dir(client_folder):
 def format_transcript(entries):
     """Format transcript entries into readable markdown."""
     lines = []
-    current_source = None
-
-    for entry in entries:
-        text = entry.get('text', '').strip()
-        source = entry.get('source', 'unknown')
-
-        if not text:
+    last_marker = None
+
+    # Speaker markers only fire when the source flips, so group consecutive
+    # same-source entries and decide the marker once per run instead of
+    # re-checking it per entry
+    for source, group in groupby(entries, key=lambda e: e.get('source', 'unknown')):
+        texts = [t for t in (e.get('text', '').strip() for e in group) if t]
+        if not texts:
             continue
 
-        if source != current_source:
-            if source == 'microphone':
-                lines.append('\n**[You]** ')
-            elif source == 'system':
-                lines.append('\n**[Other]** ')
-            else:
-                lines.append(f'\n**[{source}]** ')
-            current_source = source
+        if source == 'microphone':
+            marker = '\n**[You]** '
+        elif source == 'system':
+            marker = '\n**[Other]** '
+        else:
+            marker = f'\n**[{source}]** '
 
-        lines.append(text)
+        if marker != last_marker:
+            lines.append(marker)
+            last_marker = marker
+        lines.extend(texts)
 
     return ' '.join(lines)
 
 
 def make_filename(date_str, title):
     """Create a safe filename from date and title."""
-    safe_title = re.sub(r'[^\w\s-]', '', title)[:60].strip().replace(' ', '-')
-    safe_title = re.sub(r'-+', '-', safe_title)
+    safe_title = title.translate(_SANITIZE_TABLE)
+    if not safe_title.isascii():
+        safe_title = _UNSAFE_CHARS.sub('', safe_title)
+    safe_title = _DASH_RUN.sub('-', safe_title[:60].strip('-'))
     return f"{date_str}-{safe_title}.md"
 
 
+def _write_file(path, content):
+    """Write a transcript file in one open/write/close syscall triple.
+
+    Skips the buffered-IO layer (and its extra fstat/flush) since each file
+    is written in a single shot anyway.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, content.encode())
+    finally:
+        os.close(fd)
+
+
+def _etag(title, entries, client_folder=None):
+    """Cheap fingerprint of everything that affects a transcript's file.
+
+    Folding in the resolved client folder means route-table edits also
+    invalidate the tag, not just title/transcript changes.
+    """
+    h = hashlib.blake2b(digest_size=8)
+    h.update(title.encode())
+    h.update(str(client_folder).encode())
+    h.update(str(len(entries)).encode())
+    for e in entries:
+        h.update(e.get('text', '').encode())
+    return h.hexdigest()
+
+
 def build_content(title, doc, entries):
     """Build the markdown content for a transcript file."""
     start_time = doc.get('start_time') or doc.get('startTime') or doc.get('created_at') or ''
-    word_count = sum(len(e.get('text', '').split()) for e in entries) if entries else 0
+    word_count = _word_count(entries) if entries else 0
     doc_id = doc.get('id', 'unknown')
 
     cal_event = doc.get('google_calendar_event', {}) or {}
     cal_title = cal_event.get('summary', '')
 
-    content = f"# {title}\n\n"
-    content += f"**Meeting ID:** {doc_id}\n"
+    # Collect pieces and join once -- += on strings re-copies the whole
+    # buffer each time, which hurts on transcripts with hundreds of entries
+    parts = [f"# {title}\n\n"]
+    parts.append(f"**Meeting ID:** {doc_id}\n")
     if cal_title and cal_title != title:
-        content += f"**Calendar:** {cal_title}\n"
-    content += f"**Date:** {start_time or 'Unknown'}\n"
-    content += f"**Words:** ~{word_count}\n"
-    content += f"**Segments:** {len(entries)}\n\n"
-    content += "---\n\n"
-    content += format_transcript(entries)
+        parts.append(f"**Calendar:** {cal_title}\n")
+    parts.append(f"**Date:** {start_time or 'Unknown'}\n")
+    parts.append(f"**Words:** ~{word_count}\n")
+    parts.append(f"**Segments:** {len(entries)}\n\n")
+    parts.append("---\n\n")
+    parts.append(format_transcript(entries))
 
-    return content
+    return ''.join(parts)
 
 
 def get_date_prefix(doc):
@@ -181,26 +426,52 @@ def sync_transcripts():
     state = load_cache()
     transcripts = state.get('transcripts', {})
     documents = state.get('documents', {})
-    doc_lookup = documents if isinstance(documents, dict) else {d.get('id'): d for d in documents}
+    # map/zip/dict are all C-level, avoiding a Python-interpreted comprehension
+    # over what can be thousands of docs. A malformed doc without an id must
+    # not kill an unattended run, so fall back to the tolerant comprehension.
+    if isinstance(documents, dict):
+        doc_lookup = documents
+    else:
+        try:
+            doc_lookup = dict(zip(map(itemgetter('id'), documents), documents))
+        except KeyError:
+            doc_lookup = {d.get('id'): d for d in documents}
 
     tracking = load_tracking()
     new_count = 0
     routed_count = 0
     updated_count = 0
+    dir_snapshots = {}
+
+    # Bind the lookup once; LOAD_FAST in the loop beats a method lookup per doc
+    _get_doc = doc_lookup.get
 
     for doc_id, entries in transcripts.items():
         if not entries:
             continue
 
-        doc = doc_lookup.get(doc_id, {})
+        doc = _get_doc(doc_id, _EMPTY_DOC)
+        tracked = tracking.get(doc_id)
+        title = doc.get('title') or 'Untitled Meeting'
+        people = doc.get('people')
+
+        # Lowercase the title once and resolve the route once; both the fast
+        # skip below and the sync path proper share the result
+        client_folder = match_client(title.lower(), people, lowered=True)
+
+        # Fast skip for tracked docs: if the title, entry count, and route
+        # are all unchanged there is nothing to do -- don't even bother with
+        # is_meeting_done or the etag hash over the transcript text
+        if (tracked is not None
+                and tracked.get('entry_count') == len(entries)
+                and tracked.get('title') == title
+                and tracked.get('client') == client_folder):
+            continue
 
         if not is_meeting_done(doc, entries):
             continue
 
-        title = doc.get('title', 'Untitled Meeting')
         date_prefix = get_date_prefix(doc)
-        people = doc.get('people')
-        client_folder = match_client(title, people)
 
         if client_folder:
             dest_dir = get_client_call_notes_dir(client_folder)
@@ -210,7 +481,12 @@ def sync_transcripts():
         filename = make_filename(date_prefix, title)
         filepath = os.path.join(dest_dir, filename)
 
-        tracked = tracking.get(doc_id)
+        etag = _etag(title, entries, client_folder)
+
+        # Nothing that feeds the file changed since last run -- skip the
+        # rebuild/rewrite entirely (the common case every 5 minutes)
+        if tracked and tracked.get('etag') == etag:
+            continue
 
         if tracked:
             old_file = tracked.get('file')
@@ -218,43 +494,48 @@ def sync_transcripts():
 
             if not was_routed and client_folder and old_file:
                 old_path = os.path.join(INBOX_DIR, old_file)
-                if os.path.exists(old_path):
-                    content = build_content(title, doc, entries)
-                    with open(filepath, 'w') as f:
-                        f.write(content)
+                if _dir_contains(dir_snapshots, INBOX_DIR, old_file):
+                    _write_file(filepath, build_content(title, doc, entries))
                     os.remove(old_path)
+                    # Keep the snapshot honest -- another doc may share this
+                    # filename (same date + title) and must not see a stale name
+                    dir_snapshots[INBOX_DIR].discard(old_file)
                     tracking[doc_id] = {
                         "synced_at": datetime.now().isoformat(),
                         "routed": True,
                         "client": client_folder,
                         "file": filename,
                         "title": title,
+                        "etag": etag,
+                        "entry_count": len(entries),
                     }
                     routed_count += 1
                     print(f"Routed: {old_file} -> {client_folder}/call-notes/{filename}")
 
             elif old_file and tracked.get('title') != title:
-                old_path = os.path.join(dest_dir if was_routed else INBOX_DIR, old_file)
-                if os.path.exists(old_path):
-                    content = build_content(title, doc, entries)
-                    with open(filepath, 'w') as f:
-                        f.write(content)
+                old_dir = dest_dir if was_routed else INBOX_DIR
+                old_path = os.path.join(old_dir, old_file)
+                if _dir_contains(dir_snapshots, old_dir, old_file):
+                    _write_file(filepath, build_content(title, doc, entries))
                     if old_path != filepath:
                         os.remove(old_path)
+                        # Keep the snapshot honest -- another doc may share
+                        # this filename and must not see a stale name
+                        dir_snapshots[old_dir].discard(old_file)
                     tracking[doc_id] = {
                         "synced_at": datetime.now().isoformat(),
                         "routed": was_routed,
                         "client": client_folder if was_routed else None,
                         "file": filename,
                         "title": title,
+                        "etag": etag,
+                        "entry_count": len(entries),
                     }
                     updated_count += 1
                     print(f"Updated: {old_file} -> {filename}")
 
         else:
-            content = build_content(title, doc, entries)
-            with open(filepath, 'w') as f:
-                f.write(content)
+            _write_file(filepath, build_content(title, doc, entries))
 
             tracking[doc_id] = {
                 "synced_at": datetime.now().isoformat(),
@@ -262,6 +543,8 @@ def sync_transcripts():
                 "client": client_folder,
                 "file": filename,
                 "title": title,
+                "etag": etag,
+                "entry_count": len(entries),
             }
             new_count += 1
 
@@ -14,7 +14,26 @@ import json
 import os
 import sys
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import groupby
+from operator import itemgetter
+
+# Optional: orjson parses the (potentially huge) Granola cache several times
+# faster than stdlib json. Falls back to json if it isn't installed.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+# Optional: pysimdjson parses lazily, so only the state keys we actually read
+# get materialized as Python objects. Preferred over orjson for the big cache.
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
 
 # Granola's local cache (macOS default)
 CACHE_PATH = os.path.expanduser("~/Library/Application Support/Granola/cache-v3.json")
@@ -22,34 +41,98 @@ CACHE_PATH = os.path.expanduser("~/Library/Application Support/Granola/cache-v3.
 # Where exported transcripts go
 EXPORT_DIR = os.path.expanduser("~/granola-transcripts/exports")
 
+# Built once at import so --export doesn't pay per-transcript setup.
+# The translate table drops unsafe ASCII and maps spaces to dashes in a single
+# C-level pass; the regex only runs when non-ASCII survives the table, to
+# strip em-dashes/smart quotes while keeping accented word characters.
+_SANITIZE_TABLE = {ord(c): None for c in map(chr, range(128))
+                   if not (c.isalnum() or c in ' -_')}
+_SANITIZE_TABLE[ord(' ')] = ord('-')
+_UNSAFE_CHARS = re.compile(r'[^\w\s-]')
+_DASH_RUN = re.compile(r'-+')
+
+# Shared empty doc for cache misses; avoids allocating a fresh {} per lookup
+_EMPTY_DOC = {}
+
 
 def load_cache():
     """Load and parse Granola's cache file."""
-    with open(CACHE_PATH, 'r') as f:
-        data = json.load(f)
+    with open(CACHE_PATH, 'rb') as f:
+        raw = f.read()
+    if simdjson is not None:
+        return _load_state_lazy(raw)
+    data = _json_loads(raw)
     # Granola nests a JSON string inside the top-level JSON
-    cache = json.loads(data['cache'])
+    cache = _json_loads(data['cache'])
     return cache.get('state', {})
 
 
+def _load_state_lazy(raw):
+    """Extract just transcripts/documents from the cache via simdjson.
+
+    Granola's cache holds a lot of state the CLI never touches (calendar
+    events, panels, etc.); the lazy parser only materializes the keys we pull.
+    """
+    outer = simdjson.Parser().parse(raw)
+    inner = simdjson.Parser().parse(outer['cache'].encode())
+    try:
+        lazy_state = inner['state']
+    except KeyError:
+        return {}
+    state = {}
+    for key in ('transcripts', 'documents'):
+        try:
+            value = lazy_state[key]
+        except KeyError:
+            continue
+        if isinstance(value, simdjson.Object):
+            value = value.as_dict()
+        elif isinstance(value, simdjson.Array):
+            value = value.as_list()
+        state[key] = value
+    return state
+
+
+def _word_count(entries):
+    """Approximate word count via space counting -- no split() list per entry."""
+    total = 0
+    for e in entries:
+        text = e.get('text', '')
+        if text and not text.isspace():
+            total += text.count(' ') + 1
+    return total
+
+
 def get_transcripts_with_docs(state):
     """Get transcripts paired with their document metadata."""
     transcripts = state.get('transcripts', {})
     documents = state.get('documents', {})
 
-    doc_lookup = documents if isinstance(documents, dict) else {d.get('id'): d for d in documents}
+    # map/zip/dict are all C-level, avoiding a Python-interpreted comprehension
+    # over what can be thousands of docs. A malformed doc without an id must
+    # not kill the CLI, so fall back to the tolerant comprehension.
+    if isinstance(documents, dict):
+        doc_lookup = documents
+    else:
+        try:
+            doc_lookup = dict(zip(map(itemgetter('id'), documents), documents))
+        except KeyError:
+            doc_lookup = {d.get('id'): d for d in documents}
+
+    # Bind the lookup once; LOAD_FAST in the loop beats a method lookup per doc
+    _get_doc = doc_lookup.get
 
     results = []
     for doc_id, entries in transcripts.items():
         if not entries:
             continue
-        doc = doc_lookup.get(doc_id, {})
+        doc = _get_doc(doc_id, _EMPTY_DOC)
         results.append({
             'id': doc_id,
-            'title': doc.get('title', 'Untitled Meeting'),
+            'title': doc.get('title') or 'Untitled Meeting',
             'start_time': doc.get('start_time') or doc.get('startTime'),
             'entries': entries,
-            'word_count': sum(len(e.get('text', '').split()) for e in entries)
+            'word_count': _word_count(entries)
         })
 
     return sorted(results, key=lambda x: x.get('start_time') or '', reverse=True)
@@ -58,23 +141,27 @@ def get_transcripts_with_docs(state):
 def format_transcript(entries):
     """Format transcript entries into readable text."""
     lines = []
-    current_source = None
-
-    for entry in entries:
-        text = entry.get('text', '').strip()
-        source = entry.get('source', 'unknown')
-
-        if not text:
+    last_marker = None
+
+    # Speaker markers only fire when the source flips, so group consecutive
+    # same-source entries and decide the marker once per run instead of
+    # re-checking it per entry
+    for source, group in groupby(entries, key=lambda e: e.get('source', 'unknown')):
+        texts = [t for t in (e.get('text', '').strip() for e in group) if t]
+        if not texts:
             continue
 
-        if source != current_source:
-            if source == 'microphone':
-                lines.append('\n**[You]**')
-            elif source == 'system':
-                lines.append('\n**[Other]**')
-            current_source = source
+        if source == 'microphone':
+            marker = '\n**[You]**'
+        elif source == 'system':
+            marker = '\n**[Other]**'
+        else:
+            marker = None
 
-        lines.append(text)
+        if marker is not None and marker != last_marker:
+            lines.append(marker)
+        last_marker = marker
+        lines.extend(texts)
 
     return ' '.join(lines)
 
@@ -114,27 +201,53 @@ def show_transcript(doc_id):
     print(f"Transcript not found: {doc_id}")
 
 
+def _write_export(item):
+    """Write one (filepath, content) export in a single raw write."""
+    filepath, content = item
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, content.encode())
+    finally:
+        os.close(fd)
+
+
 def export_all():
     """Export all transcripts to markdown files."""
     os.makedirs(EXPORT_DIR, exist_ok=True)
     state = load_cache()
     transcripts = get_transcripts_with_docs(state)
 
+    filenames = []
+    contents = {}
     for t in transcripts:
         title = t['title'] or 'Untitled'
-        safe_title = re.sub(r'[^\w\s-]', '', title)[:50]
-        filename = f"{safe_title.strip().replace(' ', '-')}.md"
-        filepath = os.path.join(EXPORT_DIR, filename)
-
-        content = f"# {t['title']}\n\n"
-        content += f"**ID:** {t['id']}\n"
-        content += f"**Words:** ~{t['word_count']}\n\n"
-        content += "---\n\n"
-        content += format_transcript(t['entries'])
-
-        with open(filepath, 'w') as f:
-            f.write(content)
-
+        safe_title = title.translate(_SANITIZE_TABLE)
+        if not safe_title.isascii():
+            safe_title = _UNSAFE_CHARS.sub('', safe_title)
+        filename = f"{_DASH_RUN.sub('-', safe_title[:50].strip('-'))}.md"
+
+        # Collect pieces and join once instead of re-copying via +=
+        content = ''.join([
+            f"# {t['title']}\n\n",
+            f"**ID:** {t['id']}\n",
+            f"**Words:** ~{t['word_count']}\n\n",
+            "---\n\n",
+            format_transcript(t['entries']),
+        ])
+
+        filenames.append(filename)
+        # Recurring meetings collapse to the same title-only filename; keep
+        # the last writer per path so two threads never race on one file
+        contents[os.path.join(EXPORT_DIR, filename)] = content
+
+    # CPython drops the GIL around write() syscalls, so a small thread pool
+    # overlaps file IO latency across exports. Prints are deferred to keep
+    # output from interleaving.
+    if contents:
+        with ThreadPoolExecutor(max_workers=min(16, len(contents))) as executor:
+            list(executor.map(_write_export, contents.items()))
+
+    for filename in filenames:
         print(f"Exported: {filename}")
 
     print(f"\nAll transcripts exported to: {EXPORT_DIR}")
@@ -148,13 +261,17 @@ def search_transcripts(term):
     print(f"Searching for: '{term}'")
     print("=" * 60)
 
+    # One compiled case-insensitive pattern scans each transcript in C,
+    # instead of allocating a lowercased copy of the full text per transcript
+    term_re = re.compile(re.escape(term), re.IGNORECASE)
+
     found = 0
     for t in transcripts:
         full_text = ' '.join(e.get('text', '') for e in t['entries'])
-        if term.lower() in full_text.lower():
-            idx = full_text.lower().find(term.lower())
-            start = max(0, idx - 50)
-            end = min(len(full_text), idx + len(term) + 50)
+        m = term_re.search(full_text)
+        if m:
+            start = max(0, m.start() - 50)
+            end = min(len(full_text), m.end() + 50)
             context = full_text[start:end]
 
             print(f"\n{t['title']}")